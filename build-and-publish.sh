@@ -12,8 +12,22 @@ rm -rf build/ dist/ *.egg-info
 # Build the package
 python3 -m build
 
+# Build a single-file zipapp of the agent code. Dependencies (psutil has a C
+# extension) still come from the system site-packages. It goes in build/pyz/
+# rather than dist/ so twine only ever sees the wheel and sdist.
+echo "Building zipapp..."
+mkdir -p build/pyz
+PYZ_STAGE=$(mktemp -d)
+cp -r uptimesquirrel_agent "$PYZ_STAGE/"
+find "$PYZ_STAGE" -name __pycache__ -prune -exec rm -rf {} +
+# Legacy-layout .pyc files so zipimport can skip compilation
+python3 -m compileall -q -b "$PYZ_STAGE/uptimesquirrel_agent"
+python3 -m zipapp "$PYZ_STAGE" -p "/usr/bin/env python3" -m "uptimesquirrel_agent._cli:main" -c -o build/pyz/uptimesquirrel-agent.pyz
+rm -rf "$PYZ_STAGE"
+
 echo "Build complete. Files in dist/:"
 ls -la dist/
+echo "Zipapp: build/pyz/uptimesquirrel-agent.pyz"
 
 echo ""
 echo "To upload to PyPI:"
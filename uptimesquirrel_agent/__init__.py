@@ -6,6 +6,18 @@ __version__ = "1.2.7"
 __author__ = "UptimeSquirrel"
 __email__ = "support@uptimesquirrel.com"
 
-from .agent import UptimeSquirrelAgent
+__all__ = ["UptimeSquirrelAgent"]
 
-__all__ = ["UptimeSquirrelAgent"]
\ No newline at end of file
+
+def __getattr__(name):
+    # Import the agent module (and psutil/requests with it) only when
+    # UptimeSquirrelAgent is actually used, so reading metadata stays cheap
+    if name == "UptimeSquirrelAgent":
+        from .agent import UptimeSquirrelAgent
+        globals()[name] = UptimeSquirrelAgent
+        return UptimeSquirrelAgent
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
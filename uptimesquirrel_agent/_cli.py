@@ -0,0 +1,24 @@
+"""
+Console entry point for the UptimeSquirrel agent
+
+Answers --version without importing the agent module, so version checks
+don't pay for psutil, requests and logging setup.
+"""
+
+import os
+import sys
+
+
+def main():
+    """Main entry point"""
+    if sys.argv[1:] == ['--version']:
+        from uptimesquirrel_agent import __version__
+        print(f"{os.path.basename(sys.argv[0])} {__version__}")
+        return 0
+    
+    from uptimesquirrel_agent.agent import main as agent_main
+    return agent_main()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
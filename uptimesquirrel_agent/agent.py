@@ -24,27 +24,14 @@ import socket
 import platform
 import configparser
 import logging
-import argparse
 from datetime import datetime
-from typing import Dict, Optional, List
-import psutil
-import requests
-from requests.adapters import HTTPAdapter
+from typing import Dict, Optional, List, Tuple
 from http.client import RemoteDisconnected
-from urllib3.util.retry import Retry
 from collections import deque
-import threading
-
-# Optional SNMP support
-try:
-    from snmp_collector import SNMPCollector, SNMPDevice, SNMPVersion, load_snmp_config
-    SNMP_AVAILABLE = True
-except ImportError:
-    SNMP_AVAILABLE = False
-    logging.info("SNMP support not available. Install pysnmp to enable SNMP monitoring.")
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FutureTimeoutError
 
 # Version
-__version__ = "1.2.7"
+from uptimesquirrel_agent import __version__
 
 # Configure logging
 logging.basicConfig(
@@ -53,6 +40,84 @@ logging.basicConfig(
 )
 logger = logging.getLogger('uptimesquirrel-agent')
 
+# Virtual filesystems that never hold user data and aren't worth a statvfs()
+PSEUDO_FSTYPES = frozenset({
+    'tmpfs', 'devtmpfs', 'squashfs', 'overlay', 'proc', 'sysfs', 'cgroup',
+    'cgroup2', 'autofs', 'mqueue', 'debugfs', 'tracefs', 'configfs'
+})
+
+# Local threshold defaults, used when neither the server nor the config sets one
+DEFAULT_THRESHOLDS = {
+    'cpu': 80.0,
+    'memory': 85.0,
+    'disk': 90.0,
+    'snmp_cpu': 80.0,
+    'snmp_memory': 85.0,
+    'snmp_storage': 90.0
+}
+
+# Temperature sensor names, in order of preference
+_CPU_SENSOR_NAMES = ('coretemp', 'cpu_thermal', 'k10temp', 'acpi', 'acpitz')
+_GPU_SENSOR_NAMES = ('nouveau', 'radeon', 'amdgpu')
+
+# Units for human-readable byte sizes
+_BYTE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB', 'PB')
+
+# Most buffered metrics sent in one batch request, to keep bodies bounded
+_BATCH_CHUNK_SIZE = 50
+
+# Shared read-only default for missing nested metric sections
+_EMPTY = {}
+
+# Request body encoder, picked by _dumps() on first use
+_encoder = None
+
+
+def sd_notify(state: str):
+    """Send a state update to systemd when running as a Type=notify service"""
+    address = os.environ.get('NOTIFY_SOCKET')
+    if not address:
+        return
+    if address.startswith('@'):
+        # Abstract namespace socket
+        address = '\0' + address[1:]
+    
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as sock:
+            sock.connect(address)
+            sock.sendall(state.encode())
+    except OSError as e:
+        logger.debug(f"Failed to notify systemd: {e}")
+
+
+def _dumps(obj) -> bytes:
+    """Encode a request body as JSON, with orjson when it is installed"""
+    global _encoder
+    if _encoder is None:
+        # Resolved lazily so importing the module (--help, --version) doesn't
+        # pay for orjson; it is much faster for the nested metric dicts
+        try:
+            import orjson
+            option = orjson.OPT_NON_STR_KEYS
+            
+            def _encoder(obj):
+                return orjson.dumps(obj, option=option)
+        except ImportError:
+            def _encoder(obj):
+                return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+    return _encoder(obj)
+
+
+def _uptime(now: float) -> int:
+    """Seconds since boot, unaffected by wall-clock steps where possible"""
+    # CLOCK_BOOTTIME (Linux) counts from boot and includes suspend; psutil's
+    # boot_time() is derived from the wall clock and shifts when NTP steps it
+    clock = getattr(time, 'CLOCK_BOOTTIME', None)
+    if clock is not None:
+        return int(time.clock_gettime(clock))
+    import psutil
+    return int(now - psutil.boot_time())
+
 
 class MetricCollector:
     """Base class for metric collectors"""
@@ -64,14 +129,44 @@ class MetricCollector:
 class CPUCollector(MetricCollector):
     """Collects CPU metrics"""
     
+    def __init__(self):
+        import psutil
+        
+        # Keep our own cpu_times() snapshot rather than relying on
+        # cpu_percent(interval=None): newer psutil tracks that per thread, and
+        # collect() runs on whichever pool worker is free
+        self._last_times = psutil.cpu_times()
+        self._cpu_count = psutil.cpu_count()
+    
+    @staticmethod
+    def _split_times(times) -> Tuple[float, float]:
+        """Return (total, busy) CPU time the same way psutil.cpu_percent does"""
+        total = sum(times)
+        # guest time is already counted in user/nice on Linux
+        total -= getattr(times, 'guest', 0) + getattr(times, 'guest_nice', 0)
+        busy = total - times.idle - getattr(times, 'iowait', 0)
+        return total, busy
+    
     def collect(self) -> Dict:
-        cpu_percent = psutil.cpu_percent(interval=1)
-        cpu_count = psutil.cpu_count()
-        load_avg = os.getloadavg()
+        import psutil
+        
+        times = psutil.cpu_times()
+        total_before, busy_before = self._split_times(self._last_times)
+        total_after, busy_after = self._split_times(times)
+        self._last_times = times
+        
+        busy_delta = busy_after - busy_before
+        total_delta = total_after - total_before
+        if busy_delta <= 0 or total_delta <= 0:
+            cpu_percent = 0.0
+        else:
+            cpu_percent = round(min(100.0, busy_delta / total_delta * 100), 1)
+        
+        load_avg = os.getloadavg() if hasattr(os, 'getloadavg') else (0.0, 0.0, 0.0)
         
         return {
             'usage_percent': cpu_percent,
-            'count': cpu_count,
+            'count': self._cpu_count,
             'load_average': {
                 '1min': load_avg[0],
                 '5min': load_avg[1],
@@ -84,6 +179,8 @@ class MemoryCollector(MetricCollector):
     """Collects memory metrics"""
     
     def collect(self) -> Dict:
+        import psutil
+        
         mem = psutil.virtual_memory()
         swap = psutil.swap_memory()
         
@@ -107,6 +204,14 @@ class DiskCollector(MetricCollector):
     
     def __init__(self, config_dir: str = None):
         self.config_dir = config_dir or "/etc/uptimesquirrel"
+        # Mounts rarely change, so cache the partition list between cycles
+        self._partitions_cache = None
+        self._partitions_cache_time = 0
+        self._partitions_ttl = 60
+        # mtime of disks.json when last parsed; reloads skip unchanged files
+        self._disk_config_mtime = 0
+        # Per-mountpoint (enabled, description), rebuilt whenever the config is parsed
+        self._disk_lookup = {}
         self.disk_config = self.load_disk_config()
         self.last_config_check = time.time()
         self.config_check_interval = 60  # Check for config changes every minute
@@ -120,22 +225,43 @@ class DiskCollector(MetricCollector):
             # Create default config with all discovered disks
             self.create_default_disk_config(config_file)
         
+        try:
+            mtime = os.stat(config_file).st_mtime_ns
+        except OSError:
+            mtime = 0
+        if mtime and mtime == self._disk_config_mtime:
+            # Unchanged since the last load
+            return self.disk_config
+        
         try:
             with open(config_file, 'r') as f:
                 config = json.load(f)
+                self._disk_lookup = self._build_disk_lookup(config)
+                self._disk_config_mtime = mtime
                 logger.info(f"Loaded disk configuration from {config_file}")
                 return config
         except Exception as e:
             logger.error(f"Failed to load disk config: {e}")
+            self._disk_lookup = {}
             return {"disks": {}, "enabled": True}
     
+    @staticmethod
+    def _build_disk_lookup(config: Dict) -> Dict[str, Tuple[bool, Optional[str]]]:
+        """Flatten per-disk settings to (enabled, description) by mountpoint"""
+        return {
+            mountpoint: (disk_config.get("enabled", True), disk_config.get("description"))
+            for mountpoint, disk_config in config.get("disks", {}).items()
+        }
+    
     def create_default_disk_config(self, config_file: str):
         """Create default disk configuration with all discovered disks"""
+        import psutil
+        
         logger.info("Creating default disk configuration...")
         
         # Discover all disks
         discovered_disks = {}
-        for partition in psutil.disk_partitions():
+        for partition in self.partitions():
             if partition.fstype:
                 try:
                     usage = psutil.disk_usage(partition.mountpoint)
@@ -170,13 +296,24 @@ class DiskCollector(MetricCollector):
         except Exception as e:
             logger.error(f"Failed to create disk config: {e}")
     
-    def _format_bytes(self, bytes_val: int) -> str:
+    def partitions(self) -> List:
+        """Get mounted partitions, refreshed at most once per TTL"""
+        import psutil
+        
+        now = time.time()
+        if self._partitions_cache is None or now - self._partitions_cache_time >= self._partitions_ttl:
+            self._partitions_cache = psutil.disk_partitions(all=False)
+            self._partitions_cache_time = now
+        return self._partitions_cache
+    
+    @staticmethod
+    def _format_bytes(bytes_val: int) -> str:
         """Format bytes to human-readable string"""
-        for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
-            if bytes_val < 1024.0:
-                return f"{bytes_val:.1f} {unit}"
-            bytes_val /= 1024.0
-        return f"{bytes_val:.1f} PB"
+        if bytes_val <= 0:
+            return "0.0 B"
+        # Each unit is 2**10 of the previous, so the bit length picks the unit
+        unit = min((int(bytes_val).bit_length() - 1) // 10, len(_BYTE_UNITS) - 1)
+        return f"{bytes_val / (1 << (unit * 10)):.1f} {_BYTE_UNITS[unit]}"
     
     def collect(self) -> Dict:
         # Reload config periodically
@@ -189,29 +326,39 @@ class DiskCollector(MetricCollector):
             return {}
         
         disks = {}
-        disk_configs = self.disk_config.get("disks", {})
+        disk_lookup = self._disk_lookup
         
-        for partition in psutil.disk_partitions():
-            if partition.fstype:
+        for partition in self.partitions():
+            if partition.fstype and partition.fstype not in PSEUDO_FSTYPES:
                 # Check if this disk is in our config and enabled
-                disk_config = disk_configs.get(partition.mountpoint, {})
-                if not disk_config.get("enabled", True):
+                enabled, description = disk_lookup.get(partition.mountpoint, (True, None))
+                if not enabled:
                     continue
                 
                 try:
-                    usage = psutil.disk_usage(partition.mountpoint)
-                    disks[partition.mountpoint] = {
-                        'device': partition.device,
-                        'fstype': partition.fstype,
-                        'total': usage.total,
-                        'used': usage.used,
-                        'free': usage.free,
-                        'percent': usage.percent,
-                        'description': disk_config.get('description', f"{partition.device} ({self._format_bytes(usage.total)})")
-                    }
-                except PermissionError:
-                    # This can happen on Windows
-                    pass
+                    # statvfs directly, computed the same way as psutil.disk_usage()
+                    st = os.statvfs(partition.mountpoint)
+                except OSError:
+                    # Permission denied or stale network mount
+                    continue
+                
+                total = st.f_blocks * st.f_frsize
+                free = st.f_bavail * st.f_frsize
+                used = total - st.f_bfree * st.f_frsize
+                # Percentage as seen by unprivileged users (excludes reserved blocks)
+                total_user = used + free
+                percent = round(used / total_user * 100, 1) if total_user else 0.0
+                
+                disks[partition.mountpoint] = {
+                    'device': partition.device,
+                    'fstype': partition.fstype,
+                    'total': total,
+                    'used': used,
+                    'free': free,
+                    'percent': percent,
+                    # Only format a size when the config has no description
+                    'description': description or f"{partition.device} ({self._format_bytes(total)})"
+                }
         
         return disks
 
@@ -225,6 +372,8 @@ class DiskIOCollector(MetricCollector):
     
     def collect(self) -> Dict:
         """Collect disk I/O metrics with rate calculations"""
+        import psutil
+        
         current_time = time.time()
         counters = psutil.disk_io_counters(perdisk=True)
         
@@ -233,45 +382,37 @@ class DiskIOCollector(MetricCollector):
         
         io_data = {}
         
-        # If we have previous data, calculate rates
-        if self.last_counters and self.last_time:
-            time_delta = current_time - self.last_time
+        # On the first run there is nothing to diff against, so every disk is
+        # reported with zero rates; afterwards only disks seen last time are
+        first_run = not (self.last_counters and self.last_time)
+        last_counters = self.last_counters or {}
+        # Multiply by the reciprocal once rather than dividing every field
+        per_sec = 0.0 if first_run else 1.0 / (current_time - self.last_time)
+        
+        for disk, current in counters.items():
+            previous = last_counters.get(disk)
+            if previous is None:
+                if not first_run:
+                    continue
+                previous = current
             
-            for disk, current in counters.items():
-                if disk in self.last_counters:
-                    previous = self.last_counters[disk]
-                    
-                    # Calculate bytes per second
-                    read_rate = (current.read_bytes - previous.read_bytes) / time_delta
-                    write_rate = (current.write_bytes - previous.write_bytes) / time_delta
-                    
-                    # Calculate IOPS
-                    read_iops = (current.read_count - previous.read_count) / time_delta
-                    write_iops = (current.write_count - previous.write_count) / time_delta
-                    
-                    io_data[disk] = {
-                        'read_bytes_per_sec': int(read_rate),
-                        'write_bytes_per_sec': int(write_rate),
-                        'read_iops': round(read_iops, 2),
-                        'write_iops': round(write_iops, 2),
-                        'read_count': current.read_count,
-                        'write_count': current.write_count,
-                        'read_bytes': current.read_bytes,
-                        'write_bytes': current.write_bytes
-                    }
-        else:
-            # First run, just store absolute values
-            for disk, current in counters.items():
-                io_data[disk] = {
-                    'read_bytes_per_sec': 0,
-                    'write_bytes_per_sec': 0,
-                    'read_iops': 0,
-                    'write_iops': 0,
-                    'read_count': current.read_count,
-                    'write_count': current.write_count,
-                    'read_bytes': current.read_bytes,
-                    'write_bytes': current.write_bytes
-                }
+            read_count = current.read_count
+            write_count = current.write_count
+            read_bytes = current.read_bytes
+            write_bytes = current.write_bytes
+            
+            io_data[disk] = {
+                # Bytes per second
+                'read_bytes_per_sec': int((read_bytes - previous.read_bytes) * per_sec),
+                'write_bytes_per_sec': int((write_bytes - previous.write_bytes) * per_sec),
+                # IOPS
+                'read_iops': round((read_count - previous.read_count) * per_sec, 2),
+                'write_iops': round((write_count - previous.write_count) * per_sec, 2),
+                'read_count': read_count,
+                'write_count': write_count,
+                'read_bytes': read_bytes,
+                'write_bytes': write_bytes
+            }
         
         # Store current values for next calculation
         self.last_counters = counters
@@ -283,77 +424,69 @@ class DiskIOCollector(MetricCollector):
 class NetworkCollector(MetricCollector):
     """Collects network metrics with delta calculations"""
     
-    def __init__(self):
+    def __init__(self, skip_prefixes: Optional[List[str]] = None):
         self.last_counters = None
         self.last_time = None
+        # Interface name prefixes to ignore (loopback, container veths, ...)
+        self.skip_prefixes = tuple(skip_prefixes) if skip_prefixes is not None else ('lo',)
+        # Interfaces already matched against skip_prefixes
+        self._skip_ifaces = set()
     
     def collect(self) -> Dict:
         """Collect network metrics with bandwidth calculations"""
+        import psutil
+        
         current_time = time.time()
         counters = psutil.net_io_counters(pernic=True)
         
         # Debug: log available network interfaces
-        logger.debug(f"Available network interfaces: {list(counters.keys())}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Available network interfaces: %s", list(counters))
         
         network_data = {}
         
-        # If we have previous data, calculate rates
-        if self.last_counters and self.last_time:
-            time_delta = current_time - self.last_time
+        # On the first run there is nothing to diff against, so every interface
+        # is reported with zero rates; afterwards only interfaces seen last time are
+        first_run = not (self.last_counters and self.last_time)
+        last_counters = self.last_counters or {}
+        # Multiply by the reciprocal once rather than dividing every field
+        per_sec = 0.0 if first_run else 1.0 / (current_time - self.last_time)
+        
+        for interface, current in counters.items():
+            # Skip loopback and other ignored interfaces
+            if interface in self._skip_ifaces:
+                continue
+            if interface.startswith(self.skip_prefixes):
+                logger.debug("Skipping interface: %s", interface)
+                self._skip_ifaces.add(interface)
+                continue
             
-            for interface, current in counters.items():
-                # Skip loopback interface
-                if interface.startswith('lo'):
-                    logger.debug(f"Skipping loopback interface: {interface}")
+            previous = last_counters.get(interface)
+            if previous is None:
+                if not first_run:
                     continue
-                    
-                if interface in self.last_counters:
-                    previous = self.last_counters[interface]
-                    
-                    # Calculate bytes per second (bandwidth)
-                    bytes_sent_per_sec = (current.bytes_sent - previous.bytes_sent) / time_delta
-                    bytes_recv_per_sec = (current.bytes_recv - previous.bytes_recv) / time_delta
-                    
-                    # Calculate packets per second
-                    packets_sent_per_sec = (current.packets_sent - previous.packets_sent) / time_delta
-                    packets_recv_per_sec = (current.packets_recv - previous.packets_recv) / time_delta
-                    
-                    network_data[interface] = {
-                        'bytes_sent': current.bytes_sent,
-                        'bytes_recv': current.bytes_recv,
-                        'packets_sent': current.packets_sent,
-                        'packets_recv': current.packets_recv,
-                        'bytes_sent_per_sec': int(bytes_sent_per_sec),
-                        'bytes_recv_per_sec': int(bytes_recv_per_sec),
-                        'packets_sent_per_sec': round(packets_sent_per_sec, 2),
-                        'packets_recv_per_sec': round(packets_recv_per_sec, 2),
-                        'errin': current.errin,
-                        'errout': current.errout,
-                        'dropin': current.dropin,
-                        'dropout': current.dropout
-                    }
-        else:
-            # First run, just store absolute values
-            for interface, current in counters.items():
-                # Skip loopback interface
-                if interface.startswith('lo'):
-                    logger.debug(f"Skipping loopback interface: {interface}")
-                    continue
-                    
-                network_data[interface] = {
-                    'bytes_sent': current.bytes_sent,
-                    'bytes_recv': current.bytes_recv,
-                    'packets_sent': current.packets_sent,
-                    'packets_recv': current.packets_recv,
-                    'bytes_sent_per_sec': 0,
-                    'bytes_recv_per_sec': 0,
-                    'packets_sent_per_sec': 0,
-                    'packets_recv_per_sec': 0,
-                    'errin': current.errin,
-                    'errout': current.errout,
-                    'dropin': current.dropin,
-                    'dropout': current.dropout
-                }
+                previous = current
+            
+            bytes_sent = current.bytes_sent
+            bytes_recv = current.bytes_recv
+            packets_sent = current.packets_sent
+            packets_recv = current.packets_recv
+            
+            network_data[interface] = {
+                'bytes_sent': bytes_sent,
+                'bytes_recv': bytes_recv,
+                'packets_sent': packets_sent,
+                'packets_recv': packets_recv,
+                # Bandwidth and packet rates
+                'bytes_sent_per_sec': int((bytes_sent - previous.bytes_sent) * per_sec),
+                'bytes_recv_per_sec': int((bytes_recv - previous.bytes_recv) * per_sec),
+                'packets_sent_per_sec': round((packets_sent - previous.packets_sent) * per_sec, 2),
+                'packets_recv_per_sec': round((packets_recv - previous.packets_recv) * per_sec, 2),
+                'errin': current.errin,
+                'errout': current.errout,
+                'dropin': current.dropin,
+                'dropout': current.dropout
+            }
         
         # Store current values for next calculation
         self.last_counters = counters
@@ -361,7 +494,7 @@ class NetworkCollector(MetricCollector):
         
         # Debug logging
         if network_data:
-            logger.debug(f"NetworkCollector returning data: {network_data}")
+            logger.debug("NetworkCollector returning data: %s", network_data)
         else:
             logger.warning("NetworkCollector returning empty data")
         
@@ -371,52 +504,160 @@ class NetworkCollector(MetricCollector):
 class ServiceCollector(MetricCollector):
     """Collects service status for both systemd services and Docker containers"""
     
+    # Docker availability probe result shared by all instances: (available, checked_at)
+    _docker_available_cache = (None, 0.0)
+    _docker_available_ttl = 3600  # Re-check every hour
+    
     def __init__(self, services: List[str]):
         self.services = services
         # Check if Docker is available
-        self.docker_available = self._check_docker_available()
         if self.docker_available:
             logger.info("Docker support enabled for service monitoring")
         else:
             logger.info("Docker not available, using systemd only")
     
+    @property
+    def docker_available(self) -> bool:
+        """Whether Docker is installed, re-probed at most once per TTL"""
+        available, checked_at = ServiceCollector._docker_available_cache
+        now = time.time()
+        if available is None or now - checked_at >= self._docker_available_ttl:
+            available = self._check_docker_available()
+            ServiceCollector._docker_available_cache = (available, now)
+        return available
+    
     def _check_docker_available(self) -> bool:
         """Check if Docker is installed and accessible"""
+        import shutil
+        
+        # A PATH lookup is enough; no need to exec 'docker --version'
+        return shutil.which('docker') is not None
+    
+    def collect(self) -> Dict:
+        service_status = {}
+        
+        # Split services by type so each type is checked with a single command
+        docker_services = []
+        systemd_services = []
+        for service in self.services:
+            if service.startswith('docker-') and self.docker_available:
+                docker_services.append(service)
+            else:
+                systemd_services.append(service)
+        
+        if systemd_services:
+            service_status.update(self._check_systemd_services(systemd_services))
+        if docker_services:
+            service_status.update(self._check_docker_containers(docker_services))
+        
+        # Preserve the configured ordering
+        return {service: service_status[service] for service in self.services}
+    
+    def _check_systemd_services(self, services: List[str]) -> Dict:
+        """Check systemd service status for all services in one systemctl call"""
+        import subprocess
+        
         try:
-            import subprocess
+            # is-active prints one state per unit, in argument order
             result = subprocess.run(
-                ['docker', '--version'],
+                ['systemctl', 'is-active', *services],
                 capture_output=True,
                 text=True,
                 timeout=5
             )
-            return result.returncode == 0
-        except:
-            return False
+            states = result.stdout.splitlines()
+        except Exception as e:
+            logger.debug(f"Batched systemctl check failed: {e}")
+            states = []
+        
+        if len(states) != len(services):
+            # Unexpected output, check services one at a time
+            return {service: self._check_service(service, self._check_systemd_service, service)
+                    for service in services}
+        
+        return {
+            service: {
+                # Matches systemctl's exit code for a single unit
+                'active': state in ('active', 'reloading'),
+                'status': state,
+                'type': 'systemd'
+            }
+            for service, state in zip(services, states)
+        }
     
-    def collect(self) -> Dict:
-        service_status = {}
+    def _check_docker_containers(self, services: List[str]) -> Dict:
+        """Check Docker container status for all containers in one docker inspect call"""
+        import subprocess
         
-        for service in self.services:
-            try:
-                if service.startswith('docker-') and self.docker_available:
-                    # Handle Docker container
-                    container_name = service[7:]  # Remove 'docker-' prefix
-                    service_status[service] = self._check_docker_container(container_name)
-                else:
-                    # Handle regular systemd service
-                    service_status[service] = self._check_systemd_service(service)
-                    
-            except Exception as e:
-                logger.debug(f"Error checking service {service}: {e}")
-                service_status[service] = {
-                    'active': False,
-                    'status': 'error',
-                    'error': str(e)
-                }
+        container_names = [service[7:] for service in services]  # Remove 'docker-' prefix
+        states = {}
+        try:
+            result = subprocess.run(
+                ['docker', 'inspect', *container_names,
+                 '--format={{.Name}}|{{.State.Status}}|{{.State.Running}}|{{.State.Health.Status}}|{{.RestartCount}}'],
+                capture_output=True,
+                text=True,
+                timeout=5
+            )
+            for line in result.stdout.splitlines():
+                name, _, state = line.partition('|')
+                states[name.lstrip('/')] = state
+        except Exception as e:
+            logger.debug(f"Batched docker inspect failed: {e}")
         
+        service_status = {}
+        for service, container_name in zip(services, container_names):
+            if container_name in states:
+                service_status[service] = self._parse_docker_state(container_name, states[container_name])
+            else:
+                # Missing from the batch (not found, referenced by ID, or
+                # template error), check it on its own for an accurate status
+                service_status[service] = self._check_service(
+                    service, self._check_docker_container, container_name)
         return service_status
     
+    def _check_service(self, service: str, check, name: str) -> Dict:
+        """Run a single-service check, reporting unexpected errors as status"""
+        try:
+            return check(name)
+        except Exception as e:
+            logger.debug(f"Error checking service {service}: {e}")
+            return {
+                'active': False,
+                'status': 'error',
+                'error': str(e)
+            }
+    
+    def _parse_docker_state(self, container_name: str, output: str) -> Dict:
+        """Parse docker inspect state output into a service status"""
+        parts = output.strip().split('|')
+        container_status = parts[0] if len(parts) > 0 else 'unknown'
+        is_running = parts[1] == 'true' if len(parts) > 1 else False
+        health_status = parts[2] if len(parts) > 2 and parts[2] else None
+        restart_count = int(parts[3]) if len(parts) > 3 and parts[3].isdigit() else 0
+        
+        # Determine if container is "active"
+        # Container is active if it's running and either healthy or has no health check
+        if is_running:
+            if health_status:
+                active = health_status == 'healthy'
+                status = f"{container_status} ({health_status})"
+            else:
+                active = True
+                status = container_status
+        else:
+            active = False
+            status = container_status
+        
+        return {
+            'active': active,
+            'status': status,
+            'type': 'docker',
+            'container_name': container_name,
+            'restart_count': restart_count,
+            'health_status': health_status
+        }
+    
     def _check_docker_container(self, container_name: str) -> Dict:
         """Check Docker container status with health information"""
         import subprocess
@@ -440,34 +681,7 @@ class ServiceCollector(MetricCollector):
                     'error': f"Container {container_name} not found"
                 }
             
-            # Parse the output
-            parts = state_result.stdout.strip().split('|')
-            container_status = parts[0] if len(parts) > 0 else 'unknown'
-            is_running = parts[1] == 'true' if len(parts) > 1 else False
-            health_status = parts[2] if len(parts) > 2 and parts[2] else None
-            restart_count = int(parts[3]) if len(parts) > 3 and parts[3].isdigit() else 0
-            
-            # Determine if container is "active"
-            # Container is active if it's running and either healthy or has no health check
-            if is_running:
-                if health_status:
-                    active = health_status == 'healthy'
-                    status = f"{container_status} ({health_status})"
-                else:
-                    active = True
-                    status = container_status
-            else:
-                active = False
-                status = container_status
-            
-            return {
-                'active': active,
-                'status': status,
-                'type': 'docker',
-                'container_name': container_name,
-                'restart_count': restart_count,
-                'health_status': health_status
-            }
+            return self._parse_docker_state(container_name, state_result.stdout)
             
         except subprocess.TimeoutExpired:
             return {
@@ -516,131 +730,323 @@ class ServiceCollector(MetricCollector):
 class ThermalCollector(MetricCollector):
     """Collects temperature/thermal data"""
     
+    def __init__(self, hwmon_dir: str = '/sys/class/hwmon'):
+        # Resolve the temperature inputs of known sensors once, so each cycle
+        # reads only those files instead of every sensor on the machine
+        self.sensor_paths = self._discover_hwmon_sensors(hwmon_dir)
+    
+    def _discover_hwmon_sensors(self, hwmon_dir: str) -> Dict[str, List[str]]:
+        """Map known sensor names to their hwmon temp*_input files"""
+        wanted = set(_CPU_SENSOR_NAMES) | set(_GPU_SENSOR_NAMES)
+        sensor_paths = {}
+        
+        try:
+            hwmons = sorted(entry.path for entry in os.scandir(hwmon_dir))
+        except OSError:
+            # No hwmon sysfs (non-Linux or restricted container)
+            return sensor_paths
+        
+        for hwmon in hwmons:
+            try:
+                with open(os.path.join(hwmon, 'name')) as f:
+                    name = f.read().strip()
+                if name not in wanted:
+                    continue
+                
+                # Older kernels expose the inputs under device/
+                inputs = []
+                for base in (hwmon, os.path.join(hwmon, 'device')):
+                    if os.path.isdir(base):
+                        inputs = [os.path.join(base, entry) for entry in sorted(os.listdir(base))
+                                  if entry.startswith('temp') and entry.endswith('_input')]
+                    if inputs:
+                        break
+            except OSError:
+                continue
+            
+            if inputs:
+                sensor_paths.setdefault(name, []).extend(inputs)
+        
+        return sensor_paths
+    
+    def _read_sensor_temp(self, sensor_names: Tuple[str, ...]) -> Optional[float]:
+        """Highest reading of the first known sensor that has one"""
+        for sensor_name in sensor_names:
+            temps = []
+            for path in self.sensor_paths.get(sensor_name, ()):
+                try:
+                    with open(path) as f:
+                        temps.append(int(f.read().strip()) / 1000.0)
+                except (OSError, ValueError):
+                    continue
+            if temps:
+                return max(temps)
+        return None
+    
     def collect(self) -> Dict:
+        if self.sensor_paths:
+            cpu_temp = self._read_sensor_temp(_CPU_SENSOR_NAMES)
+            gpu_temp = self._read_sensor_temp(_GPU_SENSOR_NAMES)
+        else:
+            # No hwmon sysfs, ask psutil
+            cpu_temp, gpu_temp = self._collect_psutil()
+        
         thermal_data = {}
+        if cpu_temp is not None:
+            thermal_data['cpu_temp'] = cpu_temp
+        if gpu_temp is not None:
+            thermal_data['gpu_temp'] = gpu_temp
+        return thermal_data
+    
+    def _collect_psutil(self) -> Tuple[Optional[float], Optional[float]]:
+        """CPU and GPU temperatures from psutil's full sensor scan"""
+        import psutil
         
         try:
-            # Try to get temperature sensors
             temperatures = psutil.sensors_temperatures()
-            
-            # Look for CPU temperature
-            cpu_temp = None
-            gpu_temp = None
-            
-            # Common CPU temperature sensor names
-            cpu_sensors = ['coretemp', 'cpu_thermal', 'k10temp', 'acpi']
-            for sensor_name in cpu_sensors:
-                if sensor_name in temperatures:
-                    temps = temperatures[sensor_name]
-                    if temps:
-                        # Take the highest temperature reading
-                        cpu_temp = max(temp.current for temp in temps if temp.current is not None)
-                        break
-            
-            # Look for GPU temperature
-            gpu_sensors = ['nouveau', 'radeon', 'amdgpu']
-            for sensor_name in gpu_sensors:
-                if sensor_name in temperatures:
-                    temps = temperatures[sensor_name]
-                    if temps:
-                        gpu_temp = max(temp.current for temp in temps if temp.current is not None)
-                        break
-            
-            # If no specific sensors found, try any available temperature
-            if cpu_temp is None and temperatures:
-                all_temps = []
-                for sensor_name, temps in temperatures.items():
-                    for temp in temps:
-                        if temp.current is not None:
-                            all_temps.append(temp.current)
-                if all_temps:
-                    cpu_temp = max(all_temps)  # Use highest as CPU temp
-            
-            if cpu_temp is not None:
-                thermal_data['cpu_temp'] = cpu_temp
-            if gpu_temp is not None:
-                thermal_data['gpu_temp'] = gpu_temp
-                
         except (AttributeError, OSError):
             # sensors_temperatures not available on this platform
-            pass
+            return None, None
         
-        return thermal_data
+        def highest(sensor_names):
+            # Highest reading of the first sensor present
+            return next((max(temp.current for temp in temperatures[name] if temp.current is not None)
+                         for name in sensor_names if temperatures.get(name)), None)
+        
+        return highest(_CPU_SENSOR_NAMES), highest(_GPU_SENSOR_NAMES)
 
 
 class ProcessCollector(MetricCollector):
     """Collects process and thread metrics"""
     
+    def __init__(self):
+        # On Linux read /proc directly instead of building psutil Process objects.
+        # Keep /proc open so each cycle opens stat files relative to it rather
+        # than resolving absolute paths.
+        self._procfd = None
+        if sys.platform.startswith('linux'):
+            try:
+                self._procfd = os.open('/proc', os.O_RDONLY | os.O_DIRECTORY)
+            except OSError:
+                pass
+    
+    def __del__(self):
+        if getattr(self, '_procfd', None) is not None:
+            os.close(self._procfd)
+            self._procfd = None
+    
     def collect(self) -> Dict:
         try:
-            # Count all processes
-            all_processes = list(psutil.process_iter())
-            process_count = len(all_processes)
-            
-            # Count all threads
-            thread_count = 0
-            for proc in all_processes:
-                try:
-                    thread_count += proc.num_threads()
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    # Process may have disappeared or we don't have permission
-                    continue
-            
-            return {
-                'count': process_count,
-                'thread_count': thread_count
-            }
+            if self._procfd is not None:
+                return self._collect_procfs()
+            return self._collect_psutil()
         except Exception as e:
             logger.debug(f"Error collecting process metrics: {e}")
             return {'count': 0, 'thread_count': 0}
+    
+    def _collect_procfs(self) -> Dict:
+        """Count processes and threads with one read of /proc/<pid>/stat per process"""
+        procfd = self._procfd
+        process_count = 0
+        thread_count = 0
+        
+        for name in os.listdir(procfd):
+            if not name.isdigit():
+                continue
+            try:
+                fd = os.open(f'{name}/stat', os.O_RDONLY, dir_fd=procfd)
+                try:
+                    buf = os.read(fd, 4096)
+                finally:
+                    os.close(fd)
+            except OSError:
+                # Process may have disappeared or we don't have permission
+                continue
+            
+            # The command name can contain spaces and parentheses, so split
+            # after its closing ')'; num_threads is the 18th field from there
+            fields = buf[buf.rfind(b')') + 2:].split()
+            process_count += 1
+            try:
+                thread_count += int(fields[17])
+            except (IndexError, ValueError):
+                continue
+        
+        return {
+            'count': process_count,
+            'thread_count': thread_count
+        }
+    
+    def _collect_psutil(self) -> Dict:
+        """Count processes and threads through psutil on platforms without /proc"""
+        import psutil
+        
+        process_count = 0
+        thread_count = 0
+        # Requesting num_threads up front lets psutil fetch it in the same pass
+        # as the process listing; it's None when access is denied, and
+        # processes that disappear are skipped by process_iter itself
+        for proc in psutil.process_iter(['num_threads']):
+            process_count += 1
+            num_threads = proc.info.get('num_threads')
+            if num_threads:
+                thread_count += num_threads
+        
+        return {
+            'count': process_count,
+            'thread_count': thread_count
+        }
 
 
 class MetricBuffer:
     """Buffer for storing metrics when API is unavailable"""
     
     def __init__(self, max_size=100):
+        # deque append/popleft/len are atomic under the GIL, so no lock is needed
         self.buffer = deque(maxlen=max_size)
-        self.lock = threading.Lock()
+        self.max_size = max_size
+        
+        # Optional JSON-lines file mirroring the buffer so it survives
+        # restarts; only the long-running agent attaches one
+        self.path = None
+        self._file_lines = 0
+    
+    def attach(self, path: str):
+        """Persist the buffer to path, restoring anything a previous run left there"""
+        if not os.path.isdir(os.path.dirname(path)):
+            logger.info(f"Buffer directory for {path} does not exist, buffering in memory only")
+            return
+        self.path = path
+        self._load()
+    
+    def _load(self):
+        """Restore metrics buffered by a previous run"""
+        try:
+            with open(self.path, 'r') as f:
+                for line in f:
+                    try:
+                        self.buffer.append(json.loads(line))
+                    except ValueError:
+                        # Partially written line from a crash
+                        continue
+        except FileNotFoundError:
+            return
+        except OSError as e:
+            logger.warning(f"Failed to read metric buffer {self.path}, buffering in memory only: {e}")
+            self.path = None
+            return
+        
+        if self.buffer:
+            logger.info(f"Restored {len(self.buffer)} buffered metrics from {self.path}")
+        try:
+            self._rewrite()
+        except OSError as e:
+            logger.warning(f"Failed to write metric buffer {self.path}, buffering in memory only: {e}")
+            self.path = None
+    
+    def _rewrite(self):
+        """Replace the buffer file with the current contents of the buffer"""
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            for metrics in list(self.buffer):
+                f.write(json.dumps(metrics, separators=(',', ':')) + '\n')
+        os.replace(tmp_path, self.path)
+        self._file_lines = len(self.buffer)
     
     def add(self, metrics: Dict):
         """Add metrics to buffer"""
-        with self.lock:
-            self.buffer.append(metrics)
+        self.buffer.append(metrics)
+        if not self.path:
+            return
+        
+        try:
+            if self._file_lines >= 2 * self.max_size:
+                # Compact away lines the deque has already evicted
+                self._rewrite()
+            else:
+                with open(self.path, 'a') as f:
+                    f.write(json.dumps(metrics, separators=(',', ':')) + '\n')
+                self._file_lines += 1
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"Failed to persist buffered metrics to {self.path}: {e}")
+    
+    def extend(self, metrics_list: List[Dict]):
+        """Add several metrics to buffer, persisting them in one write"""
+        self.buffer.extend(metrics_list)
+        if not self.path:
+            return
+        
+        try:
+            if self._file_lines + len(metrics_list) >= 2 * self.max_size:
+                self._rewrite()
+            else:
+                with open(self.path, 'a') as f:
+                    f.writelines(json.dumps(metrics, separators=(',', ':')) + '\n'
+                                 for metrics in metrics_list)
+                self._file_lines += len(metrics_list)
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"Failed to persist buffered metrics to {self.path}: {e}")
     
     def get_all(self) -> List[Dict]:
         """Get all buffered metrics and clear buffer"""
-        with self.lock:
-            metrics = list(self.buffer)
-            self.buffer.clear()
-            return metrics
+        # Drain with popleft so metrics added concurrently are never lost
+        metrics = []
+        pop = self.buffer.popleft
+        try:
+            while True:
+                metrics.append(pop())
+        except IndexError:
+            pass
+        
+        if self.path and self._file_lines:
+            try:
+                open(self.path, 'w').close()
+                self._file_lines = 0
+            except OSError as e:
+                logger.warning(f"Failed to clear metric buffer {self.path}: {e}")
+        return metrics
     
     def size(self) -> int:
         """Get current buffer size"""
-        with self.lock:
-            return len(self.buffer)
+        return len(self.buffer)
 
 
 class UptimeSquirrelAgent:
     """Main agent class"""
     
     def __init__(self, config_file: str = '/etc/uptimesquirrel/agent.conf'):
+        self.config_file = config_file
+        self._config_mtime = self._get_config_mtime()
         self.config = self.load_config(config_file)
         self.api_url = self.config.get('api', 'url', fallback='https://agent-api.uptimesquirrel.com')
         self.agent_key = self.config.get('api', 'key', fallback=None)
         self.interval = self.config.getint('monitoring', 'interval', fallback=60)
         self.hostname = socket.gethostname()
-        
-        # Remote configuration
-        self.last_config_check = 0
+        # The services list is fixed for the life of the process
+        self._monitored_services = self.get_monitored_services()
+        # Host facts sent on registration, built on first register()
+        self._static_reg = None
+        
+        # Remote configuration (scheduled on the monotonic clock; -inf makes
+        # the first check in run_once fire immediately)
+        self.last_config_check = float('-inf')
         self.config_check_interval = 300  # Check every 5 minutes
         self.remote_thresholds = {}
         self.threshold_version = 0  # Track threshold version to avoid unnecessary updates
+        self._config_etag = None  # Lets the server answer 304 when config is unchanged
+        self._threshold_cache = {}
+        self._rebuild_threshold_cache()
         logger.info(f"Agent initialized with threshold version: {self.threshold_version}")
         
         # Metric buffering
-        self.metric_buffer = MetricBuffer()
+        self.metric_buffer = MetricBuffer(
+            max_size=max(1, self.config.getint('agent', 'buffer_size', fallback=100))
+        )
         self.consecutive_failures = 0
         self.max_consecutive_failures = 5
+        # Cleared if the API turns out not to have the batch metrics endpoint
+        self.batch_supported = True
+        self.alert_batch_supported = True
         
         # Initialize collectors
         # Always use /etc/uptimesquirrel for disk config
@@ -651,8 +1057,8 @@ class UptimeSquirrelAgent:
             'memory': MemoryCollector(),
             'disk': DiskCollector(config_dir=disk_config_dir),
             'disk_io': DiskIOCollector(),
-            'network': NetworkCollector(),
-            'services': ServiceCollector(self.get_monitored_services()),
+            'network': NetworkCollector(self.get_skipped_interface_prefixes()),
+            'services': ServiceCollector(self._monitored_services),
             'sensors': ThermalCollector(),
             'processes': ProcessCollector()
         }
@@ -660,14 +1066,32 @@ class UptimeSquirrelAgent:
         # Initialize SNMP collector if configured
         self._init_snmp_collector()
         
-        # Setup HTTP session with retries
+        # Collectors mostly wait on syscalls and subprocesses, so run them
+        # concurrently on a pool that lives as long as the agent
+        self.collector_timeout = 30
+        self._pool = ThreadPoolExecutor(max_workers=min(8, len(self.collectors)),
+                                        thread_name_prefix='collector')
+        # Last future per collector, so a hung collector isn't resubmitted
+        self._inflight = {}
+        
+        # Setup HTTP session with retries (requests is imported lazily so
+        # --help/--version don't pay for it)
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+        
         self.session = requests.Session()
         
-        # Configure retry strategy
+        # Configure retry strategy. Retries happen inside urllib3 on the pooled
+        # connection; a short backoff keeps a failing cycle from stalling the
+        # loop (429s still honour Retry-After)
         retry_strategy = Retry(
             total=3,
-            backoff_factor=1,
+            backoff_factor=0.3,
             status_forcelist=[429, 500, 502, 503, 504],
+            # urllib3 only retries idempotent methods by default; metric and
+            # alert delivery are POSTs
+            allowed_methods=frozenset(['GET', 'POST', 'PUT']),
         )
         
         # Configure connection pooling
@@ -682,12 +1106,18 @@ class UptimeSquirrelAgent:
         # Set headers
         self.session.headers.update({
             'User-Agent': f'UptimeSquirrel-Agent/{__version__}',
-            'X-Agent-Key': self.agent_key
+            'X-Agent-Key': self.agent_key,
+            # Bodies are pre-encoded with _dumps() and sent as data=
+            'Content-Type': 'application/json',
+            # API responses are small acks/config; compression buys nothing
+            'Accept-Encoding': 'identity'
         })
     
     def load_config(self, config_file: str) -> configparser.ConfigParser:
         """Load configuration from file"""
-        config = configparser.ConfigParser()
+        # No interpolation: the agent never uses %(name)s references, and
+        # skipping it saves a regex pass on every value lookup
+        config = configparser.ConfigParser(interpolation=None)
         
         # Default configuration
         config['api'] = {
@@ -698,79 +1128,120 @@ class UptimeSquirrelAgent:
             'interval': '60',
             'cpu_threshold': '80.0',
             'memory_threshold': '85.0',
-            'disk_threshold': '90.0'
+            'disk_threshold': '90.0',
+            'skip_interfaces': 'lo,veth,docker,br-,cali'
         }
         config['services'] = {}
         
-        # Load from file if exists
-        if os.path.exists(config_file):
-            config.read(config_file)
+        # Load from file if exists (read() skips missing files)
+        config.read(config_file)
         
         return config
     
+    def _get_config_mtime(self) -> int:
+        """Modification time of the config file, or 0 if it doesn't exist"""
+        try:
+            return os.stat(self.config_file).st_mtime_ns
+        except OSError:
+            return 0
+    
+    def _reload_config_if_changed(self) -> configparser.ConfigParser:
+        """Re-read the config file only if it changed since it was last loaded"""
+        mtime = self._get_config_mtime()
+        if mtime == self._config_mtime:
+            return self.config
+        
+        previous = self.config
+        try:
+            self.config = self.load_config(self.config_file)
+            self._rebuild_threshold_cache()
+        except (configparser.Error, ValueError) as e:
+            # Possibly caught mid-save; keep the old settings and leave the
+            # mtime alone so the file is tried again next check
+            self.config = previous
+            logger.warning(f"Ignoring invalid configuration in {self.config_file}, keeping previous settings: {e}")
+            return self.config
+        
+        self._config_mtime = mtime
+        logger.info(f"Reloaded configuration from {self.config_file}")
+        return self.config
+    
     def get_monitored_services(self) -> List[str]:
         """Get list of services to monitor from config"""
         services = []
-        if 'services' in self.config:
-            for key, value in self.config['services'].items():
-                if key.startswith('monitor_') and value.lower() == 'true':
-                    service_name = key.replace('monitor_', '')
-                    services.append(service_name)
+        # load_config always creates the section; only resolve monitor_* values
+        for key in self.config.options('services'):
+            if key.startswith('monitor_') and self.config.get('services', key).lower() == 'true':
+                service_name = key.replace('monitor_', '')
+                services.append(service_name)
         return services
     
+    def get_skipped_interface_prefixes(self) -> List[str]:
+        """Get network interface name prefixes to exclude from monitoring"""
+        value = self.config.get('monitoring', 'skip_interfaces', fallback='lo')
+        return [prefix.strip() for prefix in value.split(',') if prefix.strip()]
+    
     def _init_snmp_collector(self):
         """Initialize SNMP collector if configured and available"""
-        if not SNMP_AVAILABLE:
-            logger.info("SNMP support not available - skipping SNMP initialization")
+        # Look for SNMP device sections
+        snmp_sections = [s for s in self.config.sections() if s.startswith('snmp:')]
+        if not snmp_sections:
+            logger.info("No SNMP devices configured")
+            return
+        
+        # Optional SNMP support - only imported when devices are configured,
+        # since pysnmp and its dependencies are slow to import
+        try:
+            from snmp_collector import SNMPCollector, SNMPDevice, SNMPVersion
+        except ImportError:
+            logger.info("SNMP support not available. Install pysnmp to enable SNMP monitoring.")
             return
         
         # Load SNMP devices from config
         snmp_devices = []
         config_file = self.config._sections.get('DEFAULT', {}).get('__file__', '/etc/uptimesquirrel/agent.conf')
         
-        # Look for SNMP device sections
-        for section in self.config.sections():
-            if section.startswith('snmp:'):
-                try:
-                    device_name = section.split(':', 1)[1]
-                    logger.info(f"Loading SNMP device configuration: {device_name}")
-                    
-                    # Get device configuration
-                    hostname = self.config.get(section, 'hostname')
-                    port = self.config.getint(section, 'port', fallback=161)
-                    version = self.config.get(section, 'version', fallback='v2c')
-                    
-                    # Convert version string to enum
-                    version_enum = SNMPVersion(version)
-                    
-                    # Create device based on version
-                    if version_enum in [SNMPVersion.V1, SNMPVersion.V2C]:
-                        community = self.config.get(section, 'community', fallback='public')
-                        device = SNMPDevice(
-                            hostname=hostname,
-                            port=port,
-                            version=version_enum,
-                            community=community,
-                            timeout=self.config.getint(section, 'timeout', fallback=5),
-                            retries=self.config.getint(section, 'retries', fallback=3)
-                        )
-                    else:  # v3
-                        device = SNMPDevice(
-                            hostname=hostname,
-                            port=port,
-                            version=version_enum,
-                            username=self.config.get(section, 'username'),
-                            auth_key=self.config.get(section, 'auth_key', fallback=None),
-                            priv_key=self.config.get(section, 'priv_key', fallback=None),
-                            timeout=self.config.getint(section, 'timeout', fallback=5),
-                            retries=self.config.getint(section, 'retries', fallback=3)
-                        )
-                    
-                    snmp_devices.append(device)
-                    logger.info(f"Added SNMP device: {device_name} ({hostname}:{port} {version})")
-                    
-                except Exception as e:
-                    logger.error(f"Failed to load SNMP device {section}: {e}")
+        for section in snmp_sections:
+            try:
+                device_name = section.split(':', 1)[1]
+                logger.info(f"Loading SNMP device configuration: {device_name}")
+                
+                # Get device configuration
+                hostname = self.config.get(section, 'hostname')
+                port = self.config.getint(section, 'port', fallback=161)
+                version = self.config.get(section, 'version', fallback='v2c')
+                
+                # Convert version string to enum
+                version_enum = SNMPVersion(version)
+                
+                # Create device based on version
+                if version_enum in [SNMPVersion.V1, SNMPVersion.V2C]:
+                    community = self.config.get(section, 'community', fallback='public')
+                    device = SNMPDevice(
+                        hostname=hostname,
+                        port=port,
+                        version=version_enum,
+                        community=community,
+                        timeout=self.config.getint(section, 'timeout', fallback=5),
+                        retries=self.config.getint(section, 'retries', fallback=3)
+                    )
+                else:  # v3
+                    device = SNMPDevice(
+                        hostname=hostname,
+                        port=port,
+                        version=version_enum,
+                        username=self.config.get(section, 'username'),
+                        auth_key=self.config.get(section, 'auth_key', fallback=None),
+                        priv_key=self.config.get(section, 'priv_key', fallback=None),
+                        timeout=self.config.getint(section, 'timeout', fallback=5),
+                        retries=self.config.getint(section, 'retries', fallback=3)
+                    )
+                
+                snmp_devices.append(device)
+                logger.info(f"Added SNMP device: {device_name} ({hostname}:{port} {version})")
+                
+            except Exception as e:
+                logger.error(f"Failed to load SNMP device {section}: {e}")
         
         # Add SNMP collector if devices are configured
         if snmp_devices:
@@ -781,26 +1252,34 @@ class UptimeSquirrelAgent:
     
     def fetch_remote_config(self):
         """Fetch configuration from server"""
+        import requests
+        
         try:
+            headers = {'If-None-Match': self._config_etag} if self._config_etag else None
             response = self.session.get(
                 f"{self.api_url}/agent/config",
+                headers=headers,
                 timeout=10
             )
-            if response.status_code == 200:
+            if response.status_code == 304:
+                logger.debug("Remote config not modified")
+            elif response.status_code == 200:
                 config = response.json()
-                logger.info(f"Received config from server: {config}")
+                logger.debug("Received config from server: %s", config)
                 new_version = config.get('threshold_version', 0)
                 
                 # Only update thresholds if version has changed
-                logger.info(f"Config check - current version: {self.threshold_version}, server version: {new_version}")
+                logger.debug("Config check - current version: %s, server version: %s", self.threshold_version, new_version)
                 if new_version > self.threshold_version:
                     self.remote_thresholds = config.get('thresholds', {})
                     self.threshold_version = new_version
-                    logger.info(f"Updated thresholds from server (v{new_version}): {self.remote_thresholds}")
-                    logger.info(f"Threshold keys in response: {list(self.remote_thresholds.keys())}")
+                    logger.info("Updated thresholds from server (v%s): %s", new_version, self.remote_thresholds)
+                    self._rebuild_threshold_cache()
                 else:
-                    logger.info(f"Threshold config unchanged (v{new_version}), keeping: {self.remote_thresholds}")
+                    logger.debug("Threshold config unchanged (v%s), keeping: %s", new_version, self.remote_thresholds)
                 self.config_check_interval = config.get('check_interval', 300)
+                # Only remember the ETag once the config it names has been applied
+                self._config_etag = response.headers.get('ETag')
             elif response.status_code == 404:
                 # Endpoint not implemented yet, ignore
                 logger.debug("Remote config endpoint not available")
@@ -811,32 +1290,52 @@ class UptimeSquirrelAgent:
         except Exception as e:
             logger.error(f"Unexpected error fetching remote config: {e}")
     
+    def _rebuild_threshold_cache(self):
+        """Resolve every threshold once, preferring remote over local config"""
+        thresholds = {}
+        for metric_type, default in DEFAULT_THRESHOLDS.items():
+            # Check remote thresholds first
+            if metric_type in self.remote_thresholds:
+                try:
+                    thresholds[metric_type] = float(self.remote_thresholds[metric_type])
+                    continue
+                except (TypeError, ValueError):
+                    logger.warning(f"Ignoring invalid remote threshold for {metric_type}: {self.remote_thresholds[metric_type]!r}")
+            
+            # Fall back to local config
+            thresholds[metric_type] = self.config.getfloat('monitoring', f'{metric_type}_threshold', fallback=default)
+        
+        self._threshold_cache = thresholds
+        logger.info(f"Active thresholds ({'remote' if self.remote_thresholds else 'local'}): {thresholds}")
+    
     def get_threshold(self, metric_type: str, default: float) -> float:
         """Get threshold, preferring remote over local config"""
-        # Check remote thresholds first
-        if metric_type in self.remote_thresholds:
-            threshold = float(self.remote_thresholds[metric_type])
-            logger.info(f"Using remote threshold for {metric_type}: {threshold} (from remote_thresholds: {self.remote_thresholds})")
-            return threshold
-        
-        # Fall back to local config
-        local_threshold = self.config.getfloat('monitoring', f'{metric_type}_threshold', fallback=default)
-        logger.info(f"Using local threshold for {metric_type}: {local_threshold} (remote_thresholds: {self.remote_thresholds})")
-        return local_threshold
+        return self._threshold_cache.get(metric_type, default)
     
     def register(self):
         """Register agent with API"""
+        import requests
+        
         logger.info(f"Registering agent {self.hostname}")
         
+        if self._static_reg is None:
+            # platform.platform() runs os.uname() and libc_ver(), which scans
+            # the interpreter binary; none of these change while we run
+            import psutil
+            self._static_reg = {
+                'hostname': self.hostname,
+                'agent_version': __version__,
+                'platform': platform.platform(),
+                'cpu_count': psutil.cpu_count(),
+                'total_memory': psutil.virtual_memory().total,
+                'monitored_services': self._monitored_services
+            }
+        
         registration_data = {
-            'hostname': self.hostname,
-            'agent_version': __version__,
-            'platform': platform.platform(),
+            **self._static_reg,
             'registration_time': int(time.time()),
-            'cpu_count': psutil.cpu_count(),
-            'total_memory': psutil.virtual_memory().total,
-            'disk_paths': [p.mountpoint for p in psutil.disk_partitions()],
-            'monitored_services': self.get_monitored_services()
+            # Mounts can change; the disk collector's partition list is cached
+            'disk_paths': [p.mountpoint for p in self.collectors['disk'].partitions()]
         }
         
         try:
@@ -857,175 +1356,204 @@ class UptimeSquirrelAgent:
         """Collect all system metrics"""
         logger.debug("Collecting system metrics")
         
+        now = time.time()
+        thresholds = self._threshold_cache
         metrics = {
             'hostname': self.hostname,
-            'timestamp': int(time.time()),
-            'uptime': int(time.time() - psutil.boot_time()),
+            'timestamp': int(now),
+            'uptime': _uptime(now),
             'agent_version': __version__,
+            # Only the host thresholds; the SNMP ones aren't part of this payload
             'active_thresholds': {
-                'cpu': self.get_threshold('cpu', 80.0),
-                'memory': self.get_threshold('memory', 85.0),
-                'disk': self.get_threshold('disk', 90.0),
+                'cpu': thresholds['cpu'],
+                'memory': thresholds['memory'],
+                'disk': thresholds['disk'],
                 'version': self.threshold_version,
                 'source': 'remote' if self.remote_thresholds else 'local'
             }
         }
         
-        # Collect from each collector
+        # Collect from each collector in parallel, handling results as they
+        # finish; collector_timeout bounds the whole cycle, not each collector
+        futures = {}
         for name, collector in self.collectors.items():
-            try:
-                metrics[name] = collector.collect()
-            except Exception as e:
-                logger.error(f"Error collecting {name} metrics: {e}")
-                metrics[name] = {'error': str(e)}
+            previous = self._inflight.get(name)
+            if previous is not None and not previous.done():
+                # Don't pile more work onto a stuck collector (or run a
+                # stateful one concurrently with itself)
+                logger.warning(f"Still collecting {name} metrics from a previous cycle, skipping")
+                metrics[name] = {'error': 'timeout'}
+                continue
+            future = self._pool.submit(collector.collect)
+            self._inflight[name] = future
+            futures[future] = name
+        
+        try:
+            for future in as_completed(futures, timeout=self.collector_timeout):
+                name = futures[future]
+                try:
+                    metrics[name] = future.result()
+                except Exception as e:
+                    logger.error(f"Error collecting {name} metrics: {e}")
+                    metrics[name] = {'error': str(e)}
+        except FutureTimeoutError:
+            for future, name in futures.items():
+                if name not in metrics:
+                    # Queued collectors can still be withdrawn; running ones
+                    # stay in _inflight until they finish
+                    future.cancel()
+                    logger.error(f"Timed out collecting {name} metrics")
+                    metrics[name] = {'error': 'timeout'}
         
         return metrics
     
     def check_thresholds(self, metrics: Dict) -> List[Dict]:
         """Check if any metrics exceed configured thresholds"""
         alerts = []
+        append = alerts.append
+        ts = metrics['timestamp']
+        
+        def mk(kind, message, severity, metadata):
+            return {
+                'type': kind,
+                'message': message,
+                'severity': severity,
+                'timestamp': ts,
+                'metadata': metadata
+            }
         
         # CPU threshold
         cpu_threshold = self.get_threshold('cpu', 80.0)
-        cpu_usage = metrics.get('cpu', {}).get('usage_percent', 0)
-        logger.debug(f"Checking CPU: usage={cpu_usage:.1f}%, threshold={cpu_threshold}%")
+        cpu_usage = metrics.get('cpu', _EMPTY).get('usage_percent', 0)
+        logger.debug("Checking CPU: usage=%.1f%%, threshold=%s%%", cpu_usage, cpu_threshold)
         if cpu_usage > cpu_threshold:
-            alerts.append({
-                'type': 'cpu_high',
-                'message': f'CPU usage is {cpu_usage:.1f}% (threshold: {cpu_threshold}%)',
-                'severity': 'warning' if cpu_usage < 90 else 'critical',
-                'timestamp': metrics['timestamp'],
-                'metadata': {'usage': cpu_usage, 'threshold': cpu_threshold}
-            })
+            append(mk('cpu_high',
+                      f'CPU usage is {cpu_usage:.1f}% (threshold: {cpu_threshold}%)',
+                      'warning' if cpu_usage < 90 else 'critical',
+                      {'usage': cpu_usage, 'threshold': cpu_threshold}))
         
         # Memory threshold
         memory_threshold = self.get_threshold('memory', 85.0)
-        memory_usage = metrics.get('memory', {}).get('percent', 0)
+        memory_usage = metrics.get('memory', _EMPTY).get('percent', 0)
         if memory_usage > memory_threshold:
-            alerts.append({
-                'type': 'memory_high',
-                'message': f'Memory usage is {memory_usage:.1f}% (threshold: {memory_threshold}%)',
-                'severity': 'warning' if memory_usage < 95 else 'critical',
-                'timestamp': metrics['timestamp'],
-                'metadata': {'usage': memory_usage, 'threshold': memory_threshold}
-            })
+            append(mk('memory_high',
+                      f'Memory usage is {memory_usage:.1f}% (threshold: {memory_threshold}%)',
+                      'warning' if memory_usage < 95 else 'critical',
+                      {'usage': memory_usage, 'threshold': memory_threshold}))
         
         # Disk threshold
         disk_threshold = self.get_threshold('disk', 90.0)
-        for mount, disk_data in metrics.get('disk', {}).items():
+        for mount, disk_data in metrics.get('disk', _EMPTY).items():
             disk_usage = disk_data.get('percent', 0)
             if disk_usage > disk_threshold:
-                alerts.append({
-                    'type': 'disk_high',
-                    'message': f'Disk usage on {mount} is {disk_usage:.1f}% (threshold: {disk_threshold}%)',
-                    'severity': 'warning' if disk_usage < 95 else 'critical',
-                    'timestamp': metrics['timestamp'],
-                    'metadata': {'mount': mount, 'usage': disk_usage, 'threshold': disk_threshold}
-                })
+                append(mk('disk_high',
+                          f'Disk usage on {mount} is {disk_usage:.1f}% (threshold: {disk_threshold}%)',
+                          'warning' if disk_usage < 95 else 'critical',
+                          {'mount': mount, 'usage': disk_usage, 'threshold': disk_threshold}))
+        
+        # Most hosts report no services or SNMP devices; nothing left to walk
+        services = metrics.get('services')
+        snmp_data = metrics.get('snmp')
+        if not services and not snmp_data:
+            return alerts
+        
+        thresholds = self._threshold_cache
+        snmp_cpu_threshold = thresholds['snmp_cpu']
+        snmp_memory_threshold = thresholds['snmp_memory']
+        snmp_storage_threshold = thresholds['snmp_storage']
         
         # Service status
-        for service, status in metrics.get('services', {}).items():
+        for service, status in (services or _EMPTY).items():
             if not status.get('active', False):
-                alerts.append({
-                    'type': 'service_down',
-                    'message': f'Service {service} is not active',
-                    'severity': 'critical',
-                    'timestamp': metrics['timestamp'],
-                    'metadata': {'service': service, 'status': status.get('status')}
-                })
+                append(mk('service_down',
+                          f'Service {service} is not active',
+                          'critical',
+                          {'service': service, 'status': status.get('status')}))
         
         # SNMP device status
-        snmp_data = metrics.get('snmp', {})
-        for device_name, device_data in snmp_data.items():
+        for device_name, device_data in (snmp_data or _EMPTY).items():
             # Check if device is unreachable
             if device_data.get('status') == 'unreachable':
-                alerts.append({
-                    'type': 'snmp_device_unreachable',
-                    'message': f'SNMP device {device_name} is unreachable: {device_data.get("error", "Unknown error")}',
-                    'severity': 'critical',
-                    'timestamp': metrics['timestamp'],
-                    'metadata': {'device': device_name, 'error': device_data.get('error')}
-                })
+                append(mk('snmp_device_unreachable',
+                          f'SNMP device {device_name} is unreachable: {device_data.get("error", "Unknown error")}',
+                          'critical',
+                          {'device': device_name, 'error': device_data.get('error')}))
                 continue
             
+            interfaces = device_data.get('interfaces', ())
+            cpu_data = device_data.get('cpu', _EMPTY)
+            memory_data = device_data.get('memory', _EMPTY)
+            storage_list = device_data.get('storage', ())
+            
             # Check interface status
-            interfaces = device_data.get('interfaces', [])
             for interface in interfaces:
                 if interface.get('admin_status') == 1 and interface.get('oper_status') != 1:
-                    alerts.append({
-                        'type': 'snmp_interface_down',
-                        'message': f'Interface {interface.get("description")} on {device_name} is down',
-                        'severity': 'warning',
-                        'timestamp': metrics['timestamp'],
-                        'metadata': {
-                            'device': device_name,
-                            'interface': interface.get('description'),
-                            'index': interface.get('index')
-                        }
-                    })
+                    description = interface.get('description')
+                    append(mk('snmp_interface_down',
+                              f'Interface {description} on {device_name} is down',
+                              'warning',
+                              {
+                                  'device': device_name,
+                                  'interface': description,
+                                  'index': interface.get('index')
+                              }))
             
             # Check CPU (if available)
-            cpu_data = device_data.get('cpu', {})
             if 'usage_5min' in cpu_data:  # Cisco style
                 cpu_usage = cpu_data['usage_5min']
-                if cpu_usage > 80:
-                    alerts.append({
-                        'type': 'snmp_cpu_high',
-                        'message': f'CPU usage on {device_name} is {cpu_usage}% (5min avg)',
-                        'severity': 'warning' if cpu_usage < 90 else 'critical',
-                        'timestamp': metrics['timestamp'],
-                        'metadata': {'device': device_name, 'usage': cpu_usage}
-                    })
+                if cpu_usage > snmp_cpu_threshold:
+                    append(mk('snmp_cpu_high',
+                              f'CPU usage on {device_name} is {cpu_usage}% (5min avg)',
+                              'warning' if cpu_usage < 90 else 'critical',
+                              {'device': device_name, 'usage': cpu_usage}))
             
             # Check memory (if available)
-            memory_data = device_data.get('memory', {})
             if 'percent' in memory_data:
                 mem_usage = memory_data['percent']
-                if mem_usage > 85:
-                    alerts.append({
-                        'type': 'snmp_memory_high',
-                        'message': f'Memory usage on {device_name} is {mem_usage:.1f}%',
-                        'severity': 'warning' if mem_usage < 95 else 'critical',
-                        'timestamp': metrics['timestamp'],
-                        'metadata': {'device': device_name, 'usage': mem_usage}
-                    })
+                if mem_usage > snmp_memory_threshold:
+                    append(mk('snmp_memory_high',
+                              f'Memory usage on {device_name} is {mem_usage:.1f}%',
+                              'warning' if mem_usage < 95 else 'critical',
+                              {'device': device_name, 'usage': mem_usage}))
             
             # Check storage (if available)
-            storage_list = device_data.get('storage', [])
             for storage in storage_list:
                 storage_usage = storage.get('percent', 0)
-                if storage_usage > 90:
-                    alerts.append({
-                        'type': 'snmp_storage_high',
-                        'message': f'Storage {storage.get("description")} on {device_name} is {storage_usage:.1f}% full',
-                        'severity': 'warning' if storage_usage < 95 else 'critical',
-                        'timestamp': metrics['timestamp'],
-                        'metadata': {
-                            'device': device_name,
-                            'storage': storage.get('description'),
-                            'usage': storage_usage
-                        }
-                    })
+                if storage_usage > snmp_storage_threshold:
+                    description = storage.get('description')
+                    append(mk('snmp_storage_high',
+                              f'Storage {description} on {device_name} is {storage_usage:.1f}% full',
+                              'warning' if storage_usage < 95 else 'critical',
+                              {
+                                  'device': device_name,
+                                  'storage': description,
+                                  'usage': storage_usage
+                              }))
         
         return alerts
     
     def report_metrics(self, metrics: Dict):
         """Send metrics to API with retry and buffering"""
+        import requests
+        
         try:
             # Debug logging for network metrics
             network_data = metrics.get('network', {})
             if network_data:
-                logger.info(f"Sending network metrics: {network_data}")
+                logger.debug("Sending network metrics: %r", network_data)
             else:
                 logger.warning("No network data in metrics!")
             
+            body = _dumps({
+                'agent_version': __version__,
+                'timestamp': metrics['timestamp'],
+                'metrics': metrics
+            })
+            logger.debug("Metrics payload is %d bytes", len(body))
+            
             response = self.session.post(
                 f"{self.api_url}/agent/metrics",
-                json={
-                    'agent_version': __version__,
-                    'timestamp': metrics['timestamp'],
-                    'metrics': metrics
-                },
+                data=body,
                 timeout=30
             )
             response.raise_for_status()
@@ -1035,23 +1563,11 @@ class UptimeSquirrelAgent:
             
             # Send any buffered metrics
             if self.metric_buffer.size() > 0:
-                logger.info(f"Sending {self.metric_buffer.size()} buffered metrics")
                 buffered_metrics = self.metric_buffer.get_all()
-                for buffered in buffered_metrics:
-                    try:
-                        self.session.post(
-                            f"{self.api_url}/agent/metrics",
-                            json={
-                                'agent_version': __version__,
-                                'timestamp': buffered['timestamp'],
-                                'metrics': buffered
-                            },
-                            timeout=30
-                        )
-                    except Exception as e:
-                        logger.error(f"Failed to send buffered metric: {e}")
+                logger.info(f"Sending {len(buffered_metrics)} buffered metrics")
+                self._send_buffered_metrics(buffered_metrics)
             
-            logger.debug(f"Metrics reported successfully")
+            logger.debug("Metrics reported successfully")
             
         except requests.exceptions.RequestException as e:
             self.consecutive_failures += 1
@@ -1064,29 +1580,124 @@ class UptimeSquirrelAgent:
             else:
                 logger.error("Max consecutive failures reached, metrics may be lost")
     
+    def _send_buffered_metrics(self, buffered_metrics: List[Dict]):
+        """Deliver buffered metrics, in batch requests when the server supports it"""
+        import requests
+        
+        start = 0
+        while self.batch_supported and start < len(buffered_metrics):
+            chunk = buffered_metrics[start:start + _BATCH_CHUNK_SIZE]
+            try:
+                response = self.session.post(
+                    f"{self.api_url}/agent/metrics/batch",
+                    data=_dumps({
+                        'agent_version': __version__,
+                        'batch': [
+                            {'timestamp': buffered['timestamp'], 'metrics': buffered}
+                            for buffered in chunk
+                        ]
+                    }),
+                    timeout=30
+                )
+            except requests.exceptions.RequestException as e:
+                logger.error(f"Failed to send buffered metrics batch: {e}")
+                # Keep the unsent ones for the next successful report
+                self.metric_buffer.extend(buffered_metrics[start:])
+                return
+            
+            if response.status_code in (404, 405):
+                # Older API without the batch endpoint
+                logger.info("Batch metrics endpoint not available, sending buffered metrics individually")
+                self.batch_supported = False
+                break
+            if response.status_code >= 500:
+                logger.error(f"Failed to send buffered metrics batch: HTTP {response.status_code}")
+                self.metric_buffer.extend(buffered_metrics[start:])
+                return
+            if response.status_code >= 400:
+                # The server rejected this batch; retrying it as-is would fail
+                # forever, so give each metric its own chance instead
+                logger.warning(f"Buffered metrics batch rejected (HTTP {response.status_code}), sending individually")
+                self._send_metrics_individually(chunk)
+            start += len(chunk)
+        
+        self._send_metrics_individually(buffered_metrics[start:])
+    
+    def _send_metrics_individually(self, buffered_metrics: List[Dict]):
+        """Post buffered metrics one per request over the keep-alive connection"""
+        for buffered in buffered_metrics:
+            try:
+                response = self.session.post(
+                    f"{self.api_url}/agent/metrics",
+                    data=_dumps({
+                        'agent_version': __version__,
+                        'timestamp': buffered['timestamp'],
+                        'metrics': buffered
+                    }),
+                    timeout=30
+                )
+                response.raise_for_status()
+            except Exception as e:
+                logger.error(f"Failed to send buffered metric: {e}")
+    
     def send_alerts(self, alerts: List[Dict]):
-        """Send alerts to API"""
+        """Send alerts to API, in a single request when the server supports it"""
+        import requests
+        
         for alert in alerts:
             logger.warning(f"Alert: {alert['type']} - {alert['message']}")
-            
+        
+        if self.alert_batch_supported:
+            try:
+                response = self.session.post(
+                    f"{self.api_url}/agent/alerts/batch",
+                    data=_dumps({'alerts': alerts}),
+                    timeout=30
+                )
+                if response.status_code in (404, 405):
+                    # Older API without the batch endpoint
+                    logger.info("Batch alerts endpoint not available, sending alerts individually")
+                    self.alert_batch_supported = False
+                elif 400 <= response.status_code < 500:
+                    # Rejected as a batch; individual alerts may still be accepted
+                    logger.warning(f"Alerts batch rejected (HTTP {response.status_code}), sending alerts individually")
+                else:
+                    response.raise_for_status()
+                    logger.info(f"Sent {len(alerts)} alert(s)")
+                    return
+            except requests.exceptions.RequestException as e:
+                logger.error(f"Failed to send {len(alerts)} alert(s): {e}")
+                return
+        
+        # One request per alert over the same keep-alive connection
+        failed = 0
+        last_error = None
+        for alert in alerts:
             try:
                 response = self.session.post(
                     f"{self.api_url}/agent/alerts",
-                    json=alert,
+                    data=_dumps(alert),
                     timeout=30
                 )
                 response.raise_for_status()
                 logger.info(f"Alert sent: {alert['type']} - {alert['message']}")
             except requests.exceptions.RequestException as e:
-                logger.error(f"Failed to send alert: {e}")
+                failed += 1
+                last_error = e
+        
+        if failed:
+            logger.error(f"Failed to send {failed} of {len(alerts)} alert(s): {last_error}")
     
     def run_once(self):
         """Run one collection/reporting cycle"""
         try:
             # Check for config updates periodically
-            if time.time() - self.last_config_check > self.config_check_interval:
+            now = time.monotonic()
+            if now - self.last_config_check > self.config_check_interval:
+                # Pick up local threshold edits as well as remote changes
+                self._reload_config_if_changed()
                 self.fetch_remote_config()
-                self.last_config_check = time.time()
+                self.last_config_check = now
             
             # Collect metrics
             metrics = self.collect_metrics()
@@ -1115,29 +1726,52 @@ class UptimeSquirrelAgent:
         # The agent key is provided during installation
         logger.info("Agent initialized with provided key")
         
+        # Only the service keeps the on-disk buffer, so --test/--status never
+        # read or truncate the file out from under a running agent
+        self.metric_buffer.attach(
+            self.config.get('agent', 'buffer_file', fallback='/var/lib/uptimesquirrel/metric_buffer.jsonl')
+        )
+        
         # Initial config fetch
         self.fetch_remote_config()
+        self.last_config_check = time.monotonic()
         
         # Log initial threshold state
         logger.info(f"Starting with thresholds - CPU: {self.get_threshold('cpu', 80.0)}%, Memory: {self.get_threshold('memory', 85.0)}%, Disk: {self.get_threshold('disk', 90.0)}%")
         logger.info(f"Threshold source: {'remote' if self.remote_thresholds else 'local config'}")
         
+        # Tell systemd we're up; ping its watchdog at half the configured timeout
+        sd_notify('READY=1')
+        watchdog_usec = int(os.environ.get('WATCHDOG_USEC', 0))
+        watchdog_interval = watchdog_usec / 2000000 if watchdog_usec else None
+        
         # Main loop
         while True:
-            start_time = time.time()
+            start_time = time.monotonic()
             
             self.run_once()
+            sd_notify('WATCHDOG=1')
             
             # Sleep until next interval
-            elapsed = time.time() - start_time
+            elapsed = time.monotonic() - start_time
             sleep_time = max(0, self.interval - elapsed)
             if sleep_time > 0:
-                logger.debug(f"Sleeping for {sleep_time:.1f}s")
+                logger.debug("Sleeping for %.1fs", sleep_time)
+                if watchdog_interval:
+                    # Keep the watchdog fed during long reporting intervals
+                    while sleep_time > watchdog_interval:
+                        time.sleep(watchdog_interval)
+                        sd_notify('WATCHDOG=1')
+                        sleep_time -= watchdog_interval
                 time.sleep(sleep_time)
 
 
 def main():
     """Main entry point"""
+    # Only the CLI needs argparse; importing the module for the agent class
+    # shouldn't pay for it
+    import argparse
+    
     parser = argparse.ArgumentParser(description='UptimeSquirrel System Monitoring Agent')
     parser.add_argument('-c', '--config', default='/etc/uptimesquirrel/agent.conf',
                         help='Configuration file path')
@@ -1161,9 +1795,11 @@ def main():
     # Install systemd service if requested
     if getattr(args, 'install_service', None) is not None:
         import subprocess
-        import pkg_resources
         
-        service_file = pkg_resources.resource_filename('uptimesquirrel_agent', 'systemd/uptimesquirrel-agent.service')
+        # importlib.resources avoids pkg_resources' scan of every installed distribution
+        from importlib.resources import files
+        
+        service_file = str(files('uptimesquirrel_agent').joinpath('systemd/uptimesquirrel-agent.service'))
         
         print("Installing UptimeSquirrel Agent systemd service...")
         
@@ -1178,6 +1814,11 @@ def main():
             subprocess.run(['sudo', 'systemctl', 'daemon-reload'], check=True)
             print("✓ Service file installed")
             
+            # Make sure the agent's own bytecode exists next to the sources;
+            # under ProtectSystem=strict the service can't write it later
+            package_dir = os.path.dirname(os.path.abspath(__file__))
+            subprocess.run(['sudo', sys.executable, '-m', 'compileall', '-q', package_dir], check=False)
+            
             # Create default config if it doesn't exist
             if not os.path.exists('/etc/uptimesquirrel/agent.conf'):
                 print("\nCreating default configuration file...")